@@ -1,8 +1,6 @@
 import streamlit as st
-import pandas as pd
-import folium
-from streamlit_folium import st_folium
-from scripts.utils import configure_sidebar, connect_to_weather_stations, calculate_indices
+import streamlit.components.v1 as components
+from scripts.utils import configure_sidebar, connect_to_weather_stations, compute_hazard_df, build_hazard_featurecollection, render_station_map_html
 
 # Streamlit page configuration
 st.set_page_config(page_title="Weather Hazards", page_icon="🌤️", layout="wide")
@@ -24,7 +22,7 @@ if "station_status" in st.session_state:
 
     station_count = st.session_state["station_count"]
 
-    most_recent_date = pd.to_datetime(station_status['Last Communication Date']).max()
+    most_recent_date = station_status['Last Communication Date'].max()
 
     st.success(f"Successfully connected to {station_count} stations. Last update **{most_recent_date}** local time.")
 
@@ -40,9 +38,8 @@ if "station_status" in st.session_state:
         st.error(f"Missing required columns in the data: {set(required_columns) - set(station_status.columns)}")
         st.stop()
 
-    # Calculate indices for the stations
-    results_df = station_status.apply(calculate_indices, axis=1)
-    hazard_df = pd.concat([station_status[required_columns], results_df], axis=1)
+    # Calculate indices for all stations at once (cached across reruns)
+    hazard_df = compute_hazard_df(station_status, required_columns)
 
     # Select the hazard type using radio buttons
     hazard_type = st.radio(
@@ -65,63 +62,18 @@ if "station_status" in st.session_state:
     nudge = 0.05
     adjusted_map_center_lat = map_center_lat + nudge  # Subtract to nudge down
 
-    # Create a map with the bounds set dynamically
-    m = folium.Map(
-        location=[adjusted_map_center_lat, map_center_lon], 
-        zoom_start=9,
-        tiles="CartoDB Voyager"  # Use CartoDB Positron tiles for English place names
+    # Build the hazard markers and the map (cached across reruns)
+    feature_collection = build_hazard_featurecollection(hazard_df, value_column, stress_column)
+    map_html = render_station_map_html(
+        adjusted_map_center_lat,
+        map_center_lon,
+        feature_collection,
+        tooltip_fields=["name", "value", "stress"],
+        tooltip_aliases=["Station:", f"{value_column}:", f"{stress_column}:"],
     )
 
-    # Add stations with hazard markers
-    for _, station in station_status.iterrows():
-        stress = hazard_df.at[station.name, stress_column]
-        value = hazard_df.at[station.name, value_column]
-
-        # Check if value is numeric before rounding
-        if isinstance(value, (int, float)):
-            display_value = int(round(value, 0))
-        else:
-            display_value = "N/A"
-
-        # Tooltip for station info
-        tooltip = f"""
-        <strong>{station['Custom Name']}</strong><br>
-        {value_column}: {display_value}<br>
-        {stress_column}: {stress}
-        """
-
-        # Determine marker color based on stress category
-        color = (
-            "green" if stress in ["No heat stress", "No significant risk"] else
-            "yellow" if stress in ["Moderate heat stress", "Caution"] else
-            "orange" if stress in ["Strong heat stress", "Extreme Caution"] else
-            "red" if stress in ["Very strong heat stress", "Danger"] else
-            "darkred" if stress in ["Extreme heat stress", "Extreme Danger"] else
-            "grey"
-        )
-
-        # Determine text color for readability
-        text_color = "white" if color in ["darkred", "red", "orange"] else "black"
-
-        # Add an SVG-based marker
-        folium.Marker(
-            location=[station['Latitude'], station['Longitude']],
-            tooltip=tooltip,
-            icon=folium.DivIcon(
-                html=f"""
-                <div style="position: relative; transform: translate(-50%, -50%);">
-                    <svg xmlns="http://www.w3.org/2000/svg" height="40" width="40" viewBox="0 0 40 40">
-                        <circle cx="20" cy="20" r="15" style="fill:{color};stroke:black;stroke-width:1;fill-opacity:0.7;" />
-                        <text x="20" y="25" text-anchor="middle" fill="{text_color}" font-size="14" font-weight="bold">{display_value}</text>
-                    </svg>
-                </div>
-                """
-            ),
-        ).add_to(m)
-
-
     # Display the map above the table
-    st_folium(m, width=1200, height=600)
+    components.html(map_html, height=600)
 
     # Always display UTCI, HI, and related columns in the table
     display_columns = [
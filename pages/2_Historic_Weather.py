@@ -1,9 +1,13 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 from datetime import datetime
 import calendar
+from functools import reduce
 import plotly.graph_objects as go
-from scripts.utils import connect_to_weather_stations, fetch_historic_data, configure_sidebar
+from scripts.utils import connect_to_weather_stations, fetch_historic_data, get_latest_historic_date, build_historic_table, prepare_historic_frames, configure_sidebar
 
 # Page configuration
 st.set_page_config(page_title="Historic Data", page_icon="🌤️", layout="wide")
@@ -29,7 +33,7 @@ if "station_status" in st.session_state:
     else:
         historic_dataframes = st.session_state["historic_dataframes"]
 
-    most_recent_date = max(pd.to_datetime(df['Date/Time']).max() for df in historic_dataframes.values()).date()
+    most_recent_date = get_latest_historic_date(historic_dataframes)
     station_count = len(historic_dataframes)
 
     st.success(f"Successfully downloaded data for {station_count} stations. Last update **{most_recent_date}**.")
@@ -39,14 +43,10 @@ if "station_status" in st.session_state:
     today = datetime.today()
     earliest_date = datetime(2024, 4, 1)
 
-    previous_months = [
-        (today.replace(day=1) - pd.DateOffset(months=i)).strftime("%B %Y")
-        for i in range(60)
-    ]
-    previous_months = [
-        month for month in previous_months
-        if datetime.strptime(month, "%B %Y") >= earliest_date
-    ]
+    # List the months from the current one back to the earliest_date (newest first, at most 60)
+    previous_months = pd.date_range(
+        earliest_date, pd.Timestamp(today).normalize().replace(day=1), freq="MS"
+    ).strftime("%B %Y")[::-1][:60].tolist()
 
     # Toggle between date range and month selection
     toggle_view = st.radio(
@@ -72,7 +72,7 @@ if "station_status" in st.session_state:
         # Custom date range input
         def get_date_range(dataframes):
             combined_dates = pd.concat(
-                [pd.to_datetime(df["Date/Time"], errors="coerce") for df in dataframes.values() if "Date/Time" in df.columns]
+                [df["Date/Time"] for df in dataframes.values() if "Date/Time" in df.columns]
             ).dropna()
             return combined_dates.min().date(), combined_dates.max().date()
 
@@ -91,10 +91,9 @@ if "station_status" in st.session_state:
             st.stop()
 
     # Get available variable names across all stations
-    all_columns = set()
-    for df in historic_dataframes.values():
-        all_columns.update(df.columns)
-    all_columns = sorted(all_columns)
+    all_columns = reduce(
+        pd.Index.union, (df.columns for df in historic_dataframes.values()), pd.Index([])
+    ).sort_values().tolist()
 
     # Dropdown for variable selection
     variable = st.selectbox(
@@ -112,7 +111,7 @@ if "station_status" in st.session_state:
 
     # Prepare data for plotting
     warning_messages = []
-    plot_data = []
+    matching_columns = {}
 
     for station_name, df in historic_dataframes.items():
         if "Date/Time" not in df.columns:
@@ -124,43 +123,56 @@ if "station_status" in st.session_state:
             warning_messages.append(f"The variable '{variable}' is missing for station {station_name}.")
             continue
 
-        # Filter data for the selected range
-        df["Date/Time"] = pd.to_datetime(df["Date/Time"])
-        filtered_df = df[(df["Date/Time"] >= pd.Timestamp(start_date)) & (df["Date/Time"] <= pd.Timestamp(end_date))]
-
-        if not filtered_df.empty:
-            plot_data.append(
-                pd.DataFrame({
-                    "Date/Time": filtered_df["Date/Time"],
-                    "Value": filtered_df[matching_column],
-                    "Station": station_name
-                })
-            )
-
-    if plot_data:
-        combined_df = pd.concat(plot_data)
-        combined_df = combined_df.pivot(index="Date/Time", columns="Station", values="Value")
-
-        combined_df = combined_df.reindex(
-            pd.date_range(start_date, end_date, freq="D"), fill_value=None
+        matching_columns[station_name] = matching_column
+
+    # Slice the selected range from the date-sorted combined table, then keep the matching stations
+    # - Only the date, station and matching variable columns are converted back to pandas.
+    historic_table = build_historic_table(historic_dataframes)
+    dates = historic_table["Date/Time"].to_numpy()
+    lo = np.searchsorted(dates, np.datetime64(pd.Timestamp(start_date)), side="left")
+    hi = np.searchsorted(dates, np.datetime64(pd.Timestamp(end_date)), side="right")
+    range_table = historic_table.slice(lo, hi - lo)
+    plot_df = (
+        range_table.filter(pc.is_in(range_table["Station"], value_set=pa.array(list(matching_columns), pa.string())))
+        .select(["Date/Time", "Station", *dict.fromkeys(matching_columns.values())])
+        .to_pandas()
+    )
+
+    if not plot_df.empty:
+        # Collect each station's matching column into a single value column
+        station_columns = plot_df["Station"].map(matching_columns)
+        values = pd.Series(None, index=plot_df.index, dtype=object)
+        for column in station_columns.unique():
+            mask = station_columns == column
+            values[mask] = plot_df.loc[mask, column]
+
+        combined_df = plot_df[["Date/Time", "Station"]].assign(Value=values.infer_objects())
+        # One row per day (duplicates take the first value), dropping stations without any values
+        combined_df = (
+            combined_df.pivot_table(index="Date/Time", columns="Station", values="Value", aggfunc="first")
+            .resample("D")
+            .first()
+            .dropna(axis=1, how="all")
         )
 
-        fig = go.Figure()
-        for station in combined_df.columns:
-            fig.add_trace(
+        # Build all station traces and the layout in a single Figure call
+        fig = go.Figure(
+            data=[
                 go.Scatter(
                     x=combined_df.index,
-                    y=combined_df[station],
+                    y=combined_df[station].to_numpy(),
                     mode="lines",
                     name=station,
                 )
-            )
-
-        fig.update_layout(
-            xaxis_title="Date",
-            yaxis_title=variable,
-            legend_title="Weather Stations",
-            hovermode="x unified",
+                for station in combined_df.columns
+            ],
+            layout=go.Layout(
+                xaxis_title="Date",
+                xaxis_range=[start_date, end_date],
+                yaxis_title=variable,
+                legend_title="Weather Stations",
+                hovermode="x unified",
+            ),
         )
         st.plotly_chart(fig, use_container_width=True)
 
@@ -178,14 +190,11 @@ if "station_status" in st.session_state:
 
 
     if selected_station in historic_dataframes:
-        station_data = historic_dataframes[selected_station]
-
-        if "Date/Time" in station_data.columns:
-            station_data["Date/Time"] = pd.to_datetime(station_data["Date/Time"])
-            filtered_data = station_data[
-                (station_data["Date/Time"] >= pd.Timestamp(start_date))
-                & (station_data["Date/Time"] <= pd.Timestamp(end_date))
-            ]
+        indexed_dataframes = prepare_historic_frames(historic_dataframes)
+
+        if selected_station in indexed_dataframes:
+            # Slice the date-indexed station data for the selected range
+            filtered_data = indexed_dataframes[selected_station].loc[pd.Timestamp(start_date):pd.Timestamp(end_date)]
 
 
             # Use formatted dates in the table header
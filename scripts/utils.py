@@ -1,30 +1,90 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import folium
+from folium.plugins import FastMarkerCluster
 import requests
+import httpx
+import orjson
 from requests.auth import HTTPBasicAuth
+from requests.adapters import HTTPAdapter
 import datetime
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Maximum number of hourly station downloads at the same time
+HOURLY_FETCH_WORKERS = 16
+
+# Connections kept open per host by the shared HTTP session
+HTTP_POOL_SIZE = 32
+
+
+@st.cache_resource(show_spinner=False)
+def get_http_session():
+    """
+    Creates the HTTP session shared by all downloads, so connections (and their TLS handshakes) are reused.
+
+    Returns:
+        requests.Session: A session with a connection pool large enough for the concurrent downloads.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+@st.cache_resource(show_spinner=False)
+def get_fieldclimate_client():
+    """
+    Creates the HTTP/2 client shared by the hourly FieldClimate downloads, so concurrent station requests are
+    multiplexed over a single connection.
+
+    Returns:
+        httpx.Client: A thread-safe client, using pooled HTTP/1.1 connections if the h2 package is not installed.
+    """
+    limits = httpx.Limits(max_connections=HTTP_POOL_SIZE, max_keepalive_connections=HTTP_POOL_SIZE)
+    try:
+        return httpx.Client(http2=True, limits=limits, timeout=30)
+    except ImportError:
+        return httpx.Client(limits=limits, timeout=30)
+
 
 def connect_to_weather_stations():
     """
     Connects to weather stations and fetches data, persisting the session state.
     """
     # Check if session state already has data
-    if "access_token" in st.session_state and "station_status" in st.session_state:
+    if "station_status" in st.session_state:
         return
 
     try:
-        # Step 1: Retrieve access token
+        # Step 1: Retrieve access token (cached across reruns and sessions)
         access_token = get_access_token()
-        st.session_state["access_token"] = access_token
 
-        # Step 2: Fetch weather station data
+        # Step 2: Fetch weather station data (cached for 10 minutes)
         stations_data = get_weather_stations(access_token)
         station_status = process_station_data(stations_data)
-        
-        # Parse coordinates into separate columns
-        station_status[["Latitude", "Longitude"]] = station_status["Coordinates (Latitude, Longitude)"].str.extract(
-            r"\(([^,]+), ([^)]+)\)"
-        ).astype(float)
+
+        # Parse communication dates once so pages can reduce them directly
+        station_status["Last Communication Date"] = pd.to_datetime(
+            station_status["Last Communication Date"], format="%Y-%m-%d %H:%M:%S", errors="coerce"
+        )
+
+        # Use Arrow-backed dtypes so Streamlit can hand the frame to the browser without copying
+        # Python objects, and store sensor readings as float32 (their precision doesn't need float64)
+        station_status = station_status.convert_dtypes(dtype_backend="pyarrow")
+        weather_columns = [
+            'Air Temperature (°C)', 'Relative Humidity (%)', 'Soil Temperature (°C)',
+            'Solar Radiation (W/m²)', 'Rain Last (mm)', 'Wind Speed (m/s)',
+            'Volumetric Water Content (Average) (%)'
+        ]
+        for col in weather_columns:
+            station_status[col] = pd.to_numeric(station_status[col], errors="coerce").astype("float32")
 
         # Step 3: Store in session state
         st.session_state["station_status"] = station_status
@@ -34,13 +94,11 @@ def connect_to_weather_stations():
         st.error(str(e))
         st.stop()
 
+@st.cache_resource(show_spinner=False, ttl=3300)
 def get_access_token():
     """
-    Retrieves an access token and saves it to session state if not already available.
+    Retrieves an access token, shared across reruns and sessions until shortly before it expires.
     """
-    if "access_token" in st.session_state:
-        return st.session_state["access_token"]
-
     try:
         client_id = st.secrets["client_id"]
         client_secret = st.secrets["client_secret"]
@@ -53,13 +111,12 @@ def get_access_token():
             auth=HTTPBasicAuth(client_id, client_secret)
         )
         response.raise_for_status()
-        access_token = response.json().get("access_token")
-        st.session_state["access_token"] = access_token
-        return access_token
+        return response.json().get("access_token")
     except requests.RequestException as e:
         raise Exception(f"Failed to obtain access token: {e}")
 
 
+@st.cache_data(show_spinner=False, ttl=600)
 def get_weather_stations(access_token):
     """
     Fetches weather station data using the access token.
@@ -72,98 +129,159 @@ def get_weather_stations(access_token):
         }
         response = requests.get(stations_url, headers=headers)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     except requests.RequestException as e:
         raise Exception(f"Failed to retrieve weather station data: {e}")
 
 
 # Helper function for column matching
 def match_columns(columns, patterns):
+    """
+    Finds the first column containing one of the patterns, ignoring case.
+
+    Args:
+        columns (dict or iterable): Column names, or a {lowercased name: name} map built once per DataFrame.
+        patterns (list): Patterns to look for, in order of preference.
+
+    Returns:
+        str: The matching column name, or None if no column matches.
+    """
+    lowered = columns if isinstance(columns, dict) else {col.lower(): col for col in columns}
     for pattern in patterns:
-        for col in columns:
-            if pattern.lower() in col.lower():
+        pattern = pattern.lower()
+        for lowered_col, col in lowered.items():
+            if pattern in lowered_col:
                 return col
     return None
 
-def get_hourly_data():
+# Hourly sensor columns used for the indices, in order of preference
+HOURLY_REQUIRED_COLUMNS = {
+    'Air Temperature': ['Air temperature (avg)', 'HC Air temperature (avg)'],
+    'Relative Humidity': ['Relative humidity (avg)', 'HC Relative humidity (avg)'],
+    'Wind Speed': ['Wind speed (avg)', 'U-sonic wind speed (avg)'],
+    'Solar Radiation': ['Solar radiation (avg)']
+}
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def fetch_station_hourly(station_id, access_token, hour_bucket):
     """
-    Fetch hourly weather data for the last 5 days, process it, and return a dictionary of DataFrames for each station.
+    Fetches and processes the hourly data of a single station for the last 5 days.
+
+    Args:
+        station_id (str): The original station ID.
+        access_token (str): API access token.
+        hour_bucket (str): The current UTC hour, so cached data is refreshed when a new hour starts.
+
+    Returns:
+        pd.DataFrame: The station's hourly data with the standardised columns and indices,
+        or None if the station returned no sensor data.
+
+    Raises:
+        httpx.HTTPStatusError: If the API does not return the station's data.
     """
     # Constants
     data_group = 'hourly'
     time_period = '5d'
 
+    headers = {
+        'Authorization': f'Bearer {access_token}',
+        'Accept': 'application/json'
+    }
+    data_url = f"https://api.fieldclimate.com/v2/data/{station_id}/{data_group}/last/{time_period}"
+    response = get_fieldclimate_client().get(data_url, headers=headers)
+    response.raise_for_status()
+    station_info = orjson.loads(response.content)  # Faster than the stdlib parser for the large sample arrays
+
+    # Stations without sensor data have nothing to tabulate
+    sensors = station_info.get('data') or []
+    if not sensors:
+        return None
+
+    # Parse the dates up front (cache=True parses each repeated timestamp string once) and
+    # add one float32 "<sensor> (<aggregation>)" column per sensor value series (missing readings become NaN)
+    station_dict = {
+        'dates': pd.to_datetime(station_info.get('dates', []), cache=True),
+        **{
+            f"{sensor.get('name', 'Unknown Sensor')} ({agg_type})": np.asarray(values, dtype=np.float32)
+            for sensor in sensors
+            for agg_type, values in sensor.get('values', {}).items()
+        },
+    }
+
+    station_df = pd.DataFrame(station_dict)
+
+    # Match and standardise columns (lowercasing the column names once for all four lookups)
+    lowered_columns = {col.lower(): col for col in station_df.columns}
+    air_temp_col = match_columns(lowered_columns, HOURLY_REQUIRED_COLUMNS['Air Temperature'])
+    humidity_col = match_columns(lowered_columns, HOURLY_REQUIRED_COLUMNS['Relative Humidity'])
+    wind_speed_col = match_columns(lowered_columns, HOURLY_REQUIRED_COLUMNS['Wind Speed'])
+    solar_radiation_col = match_columns(lowered_columns, HOURLY_REQUIRED_COLUMNS['Solar Radiation'])
+
+    station_df['Air Temperature (°C)'] = station_df[air_temp_col] if air_temp_col else None
+    station_df['Relative Humidity (%)'] = station_df[humidity_col] if humidity_col else None
+    station_df['Wind Speed (m/s)'] = station_df[wind_speed_col] if wind_speed_col else None
+    station_df['Solar Radiation (W/m²)'] = station_df[solar_radiation_col] if solar_radiation_col else 0
+
+    # Without temperature, humidity or wind every hour is N/A, so skip the calculation
+    if air_temp_col is None or humidity_col is None or wind_speed_col is None:
+        na_values = np.full(len(station_df), 'N/A', dtype=object)
+        station_df['UTCI'] = na_values
+        station_df['Heat Index'] = na_values
+        station_df['UTCI Stress'] = pd.Categorical(na_values, dtype=UTCI_STRESS_DTYPE)
+        station_df['Heat Index Stress'] = pd.Categorical(na_values, dtype=HEAT_INDEX_STRESS_DTYPE)
+        return station_df
+
+    # Calculate indices for all hours at once and add columns
+    indices = calculate_indices_vectorized(station_df)
+    station_df[['UTCI', 'Heat Index', 'UTCI Stress', 'Heat Index Stress']] = indices
+
+    return station_df
+
+
+def get_hourly_data():
+    """
+    Fetch hourly weather data for the last 5 days, process it, and return a dictionary of DataFrames for each station.
+    """
     # Ensure session state has the required data
-    if not ("access_token" in st.session_state and "station_status" in st.session_state):
+    if "station_status" not in st.session_state:
         connect_to_weather_stations()
 
-    access_token = st.session_state["access_token"]
+    access_token = get_access_token()
     station_status = st.session_state["station_status"]
     station_count = st.session_state["station_count"]
 
-    headers = {
-        'Authorization': f'Bearer {access_token}',
-        'Accept': 'application/json'
-    }
-
     stations_hourly_latest = {}
     status_message = ""
 
-    required_columns = {
-        'Air Temperature': ['Air temperature (avg)', 'HC Air temperature (avg)'],
-        'Relative Humidity': ['Relative humidity (avg)', 'HC Relative humidity (avg)'],
-        'Wind Speed': ['Wind speed (avg)', 'U-sonic wind speed (avg)'],
-        'Solar Radiation': ['Solar radiation (avg)']
-    }
+    # Plain object array of the IDs (no intermediate Python list)
+    station_ids = station_status["Station ID (original)"].to_numpy(dtype=object)
 
-    # Iterate over stations to fetch and process data
-    for i, station_id in enumerate(station_status["Station ID (original)"].tolist()):
-        data_url = f"https://api.fieldclimate.com/v2/data/{station_id}/{data_group}/last/{time_period}"
-        response = requests.get(data_url, headers=headers)
-
-        if response.status_code == 200:
-            station_info = response.json()
-            dates = station_info.get('dates', [])
-            station_dict = {'dates': dates}
-
-            # Process sensor data
-            for sensor in station_info.get('data', []):
-                sensor_name = sensor.get('name', 'Unknown Sensor')
-                for agg_type, values in sensor.get('values', {}).items():
-                    column_name = f"{sensor_name} ({agg_type})"
-                    station_dict[column_name] = values
-
-            station_df = pd.DataFrame(station_dict)
-
-            if 'dates' in station_df:
-                station_df['dates'] = pd.to_datetime(station_df['dates'])
-
-            # Match and standardise columns
-            air_temp_col = match_columns(station_df.columns, required_columns['Air Temperature'])
-            humidity_col = match_columns(station_df.columns, required_columns['Relative Humidity'])
-            wind_speed_col = match_columns(station_df.columns, required_columns['Wind Speed'])
-            solar_radiation_col = match_columns(station_df.columns, required_columns['Solar Radiation'])
-
-            station_df['Air Temperature (°C)'] = station_df[air_temp_col] if air_temp_col else None
-            station_df['Relative Humidity (%)'] = station_df[humidity_col] if humidity_col else None
-            station_df['Wind Speed (m/s)'] = station_df[wind_speed_col] if wind_speed_col else None
-            station_df['Solar Radiation (W/m²)'] = station_df[solar_radiation_col] if solar_radiation_col else 0
-
-            # Calculate indices and add columns
-            indices = station_df.apply(calculate_indices, axis=1)
-            station_df['UTCI'] = indices['UTCI']
-            station_df['Heat Index'] = indices['Heat Index']
-            station_df['UTCI Stress'] = indices['UTCI Stress']
-            station_df['Heat Index Stress'] = indices['Heat Index Stress']
+    # Stations are cached per UTC hour, so repeat sessions within the hour skip the API
+    hour_bucket = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m-%d %H:00")
 
-            stations_hourly_latest[station_id] = station_df
+    def fetch(station_id):
+        try:
+            return fetch_station_hourly(station_id, access_token, hour_bucket), None
+        except httpx.HTTPStatusError as e:
+            return None, e.response
 
-        elif response.status_code == 404:
+    # Fetch all stations concurrently over the shared HTTP/2 client (results keep the station order)
+    with ThreadPoolExecutor(max_workers=HOURLY_FETCH_WORKERS) as executor:
+        results = list(executor.map(fetch, station_ids))
+
+    # Collect the station data and report failed stations
+    for i, (station_id, (station_df, error_response)) in enumerate(zip(station_ids, results)):
+        if station_df is not None:
+            stations_hourly_latest[station_id] = station_df
+        elif error_response is None:
+            status_message += f"Station {i+1}/{station_count}: No hourly data for station {station_id}. Skipping.\n"
+        elif error_response.status_code == 404:
             status_message += f"Station {i+1}/{station_count}: Error 404: Station ID {station_id} not found. Skipping.\n"
         else:
             status_message += (
                 f"Station {i+1}/{station_count}: Failed to retrieve data for station {station_id}. "
-                f"Status Code: {response.status_code}\nResponse: {response.text}\n"
+                f"Status Code: {error_response.status_code}\nResponse: {error_response.text}\n"
             )
 
     # Store processed data in session state
@@ -172,116 +290,726 @@ def get_hourly_data():
     return stations_hourly_latest, status_message
 
 
+# Columns of the processed station table, in display order
+STATION_COLUMNS = [
+    'Station ID (original)', 'Custom Name', 'Device Name', 'UID', 'Firmware Version', 'Hardware Version',
+    'Rights (rw)', 'Starred', 'Programmed Date', 'Created Date', 'Country', 'Coordinates (Latitude, Longitude)',
+    'Latitude', 'Longitude', 'Altitude (m)', 'Air Temperature (°C)', 'Relative Humidity (%)',
+    'Soil Temperature (°C)', 'Solar Radiation (W/m²)', 'Rain Last (mm)', 'Wind Speed (m/s)',
+    'Volumetric Water Content (Average) (%)', 'Battery Voltage (mV)', 'Solar Panel Voltage (mV)',
+    'Networking Type', 'Roaming Status', 'Last Communication Date',
+]
+
+# Numeric station columns, stored as nullable floats (missing values become <NA> instead of "N/A")
+STATION_NUMERIC_COLUMNS = [
+    'Latitude', 'Longitude', 'Altitude (m)', 'Air Temperature (°C)', 'Relative Humidity (%)',
+    'Soil Temperature (°C)', 'Solar Radiation (W/m²)', 'Rain Last (mm)', 'Wind Speed (m/s)',
+    'Volumetric Water Content (Average) (%)', 'Battery Voltage (mV)', 'Solar Panel Voltage (mV)',
+]
+
+
+@st.cache_data(show_spinner=False, ttl=600)
 def process_station_data(stations_data):
     """
     Processes raw weather station data into a structured Pandas DataFrame.
+
+    Values are collected column by column and converted in bulk, rather than building a dict per station.
+
     Args:
         stations_data (list): Raw data from the weather station API.
     Returns:
         pd.DataFrame: Processed data in tabular format.
     """
-    stations_list = []
+    columns = {column: [] for column in STATION_COLUMNS}
+    column_lists = list(columns.values())
     for station in stations_data:
         position = station.get('position', {}) or {}
         coordinates = position.get('geo', {}).get('coordinates', ['N/A', 'N/A'])
-        altitude = position.get('altitude', 'N/A')
         dates = station.get('dates', {}) or {}
         meta = station.get('meta', {}) or {}
         networking = station.get('networking', {}) or {}
         info = station.get('info', {}) or {}
         name = station.get('name', {}) or {}
 
-        station_info = {
-            'Station ID (original)': name.get('original', 'N/A'),
-            'Custom Name': name.get('custom', 'N/A'),
-            'Device Name': info.get('device_name', 'N/A'),
-            'UID': info.get('uid', 'N/A'),
-            'Firmware Version': info.get('firmware', 'N/A'),
-            'Hardware Version': info.get('hardware', 'N/A'),
-            'Rights (rw)': station.get('rights', 'N/A'),
-            'Starred': station.get('starred', 'N/A'),
-            'Programmed Date': info.get('programmed', 'N/A'),
-            'Created Date': dates.get('created_at', 'N/A'),
-            'Country': position.get('country', 'N/A'),
-            'Coordinates (Latitude, Longitude)': f"({coordinates[1]}, {coordinates[0]})",
-            'Altitude (m)': altitude,
-            'Air Temperature (°C)': meta.get('airTemp', 'N/A'),
-            'Relative Humidity (%)': meta.get('rh', 'N/A'),
-            'Soil Temperature (°C)': meta.get('soilTemp', 'N/A'),
-            'Solar Radiation (W/m²)': meta.get('solarRadiation', 'N/A'),
-            'Rain Last (mm)': meta.get('rain_last', 'N/A'),
-            'Wind Speed (m/s)': meta.get('windSpeed', 'N/A'),
-            'Volumetric Water Content (Average) (%)': meta.get('volumetricAverage', 'N/A'),
-            'Battery Voltage (mV)': meta.get('battery', 'N/A'),
-            'Solar Panel Voltage (mV)': meta.get('solarPanel', 'N/A'),
-            'Networking Type': networking.get('type', 'N/A'),
-            'Roaming Status': networking.get('roaming', 'N/A'),
-            'Last Communication Date': dates.get('last_communication', 'N/A'),
+        # One value per column, in STATION_COLUMNS order (coordinates are [longitude, latitude])
+        values = (
+            name.get('original', 'N/A'),
+            name.get('custom', 'N/A'),
+            info.get('device_name', 'N/A'),
+            info.get('uid', 'N/A'),
+            info.get('firmware', 'N/A'),
+            info.get('hardware', 'N/A'),
+            station.get('rights', 'N/A'),
+            station.get('starred', 'N/A'),
+            info.get('programmed', 'N/A'),
+            dates.get('created_at', 'N/A'),
+            position.get('country', 'N/A'),
+            f"({coordinates[1]}, {coordinates[0]})",
+            coordinates[1],
+            coordinates[0],
+            position.get('altitude'),
+            meta.get('airTemp'),
+            meta.get('rh'),
+            meta.get('soilTemp'),
+            meta.get('solarRadiation'),
+            meta.get('rain_last'),
+            meta.get('windSpeed'),
+            meta.get('volumetricAverage'),
+            meta.get('battery'),
+            meta.get('solarPanel'),
+            networking.get('type', 'N/A'),
+            networking.get('roaming', 'N/A'),
+            dates.get('last_communication', 'N/A'),
+        )
+        for column_list, value in zip(column_lists, values):
+            column_list.append(value)
+
+    station_status = pd.DataFrame(columns)
+
+    # Convert the numeric columns in bulk, treating anything non-numeric (e.g. "N/A") as missing
+    station_status[STATION_NUMERIC_COLUMNS] = station_status[STATION_NUMERIC_COLUMNS].apply(
+        pd.to_numeric, errors="coerce"
+    ).astype("Float64")
+    return station_status
+
+# Color scale of each indicator, as (upper bounds, colors): values up to and including bounds[i] get colors[i],
+# values above the last bound get the last color. Rain repeats "lightblue" so that exactly 0 mm alone is white.
+COLOR_SCHEMES = {
+    "Air Temperature (°C)": (
+        np.array([0, 10, 20, 30, 35, 40]),
+        np.array(["darkblue", "blue", "lightgreen", "yellow", "orange", "red", "darkred"], dtype=object),
+    ),
+    "Relative Humidity (%)": (
+        np.array([40, 60]),
+        np.array(["lightyellow", "lightgreen", "lightblue"], dtype=object),
+    ),
+    "Rain Last (mm)": (
+        np.array([np.nextafter(0, -1), 0, 5, 10]),
+        np.array(["lightblue", "white", "lightblue", "blue", "darkblue"], dtype=object),
+    ),
+    "Wind Speed (m/s)": (
+        np.array([3, 7]),
+        np.array(["lightgreen", "yellow", "red"], dtype=object),
+    ),
+}
+
+
+def get_color_scheme_vectorized(values, indicator):
+    """
+    Determines the color scheme for a whole column of indicator values at once.
+
+    Looks up the COLOR_SCHEMES scale with one np.searchsorted over the array.
+
+    Args:
+        values (array-like): Numeric values of the indicator. NaN marks missing data.
+        indicator (str): The name of the indicator (e.g., "Air Temperature (°C)", "Relative Humidity (%)").
+
+    Returns:
+        np.ndarray: The colors corresponding to each value.
+    """
+    values = np.asarray(values, dtype=float)
+
+    if indicator not in COLOR_SCHEMES:
+        # Default case if indicator doesn't match
+        return np.full(values.shape, "grey", dtype=object)
+
+    bounds, colors = COLOR_SCHEMES[indicator]
+    result = colors[np.searchsorted(bounds, values, side="left")]
+
+    # Grey for N/A values takes precedence over every bucket
+    result[np.isnan(values)] = "grey"
+    return result
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def build_marker_featurecollection(station_status, indicator):
+    """
+    Builds a GeoJSON FeatureCollection with one marker per station for the selected indicator.
+
+    Args:
+        station_status (pd.DataFrame): Station data including coordinates and indicator values.
+        indicator (str): The indicator to display (e.g., "Air Temperature (°C)", "Wind Speed (km/h)").
+
+    Returns:
+        dict: FeatureCollection with the station name, display value and color in each feature's properties.
+    """
+    # Compute the display text and color for every station in one pass
+    # - Wind speed is displayed in km/h but bucketed into colors in m/s.
+    color_field = indicator.replace(" (km/h)", " (m/s)")
+    values = pd.to_numeric(station_status[indicator], errors="coerce")  # Set invalid values to NaN
+    color_values = pd.to_numeric(station_status[color_field], errors="coerce")
+    rounded_values = values.round(0)
+
+    markers = station_status.assign(
+        color=get_color_scheme_vectorized(color_values, color_field),
+        display_value=np.where(rounded_values.isna(), "-", rounded_values.fillna(0).astype(int).astype(str)),  # Use "-" for missing values
+    ).dropna(subset=["Latitude", "Longitude"])
+
+    lats, lons, names, display_values, colors = (
+        markers[col].to_numpy() for col in ("Latitude", "Longitude", "Custom Name", "display_value", "color")
+    )
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"name": name, "value": display_value, "color": color},
+        }
+        for lat, lon, name, display_value, color in zip(lats, lons, names, display_values, colors)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Marker color for each UTCI and Heat Index stress category
+STRESS_TO_COLOR = {
+    "No heat stress": "green",
+    "No significant risk": "green",
+    "Moderate heat stress": "yellow",
+    "Caution": "yellow",
+    "Strong heat stress": "orange",
+    "Extreme Caution": "orange",
+    "Very strong heat stress": "red",
+    "Danger": "red",
+    "Extreme heat stress": "darkred",
+    "Extreme Danger": "darkred",
+}
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def build_hazard_featurecollection(hazard_df, value_column, stress_column):
+    """
+    Builds a GeoJSON FeatureCollection with one hazard marker per station.
+
+    Args:
+        hazard_df (pd.DataFrame): Station data with calculated indices and stress categories.
+        value_column (str): The index to display (e.g., "Heat Index", "UTCI").
+        stress_column (str): The matching stress category column (e.g., "Heat Index Stress").
+
+    Returns:
+        dict: FeatureCollection with the station name, display value, stress and color in each feature's properties.
+    """
+    # Compute the display text and color for every station in one pass
+    rounded_values = pd.to_numeric(hazard_df[value_column], errors="coerce").round(0)
+
+    markers = hazard_df.assign(
+        color=hazard_df[stress_column].astype(object).map(STRESS_TO_COLOR).fillna("grey"),
+        display_value=np.where(rounded_values.isna(), "N/A", rounded_values.fillna(0).astype(int).astype(str)),
+    ).dropna(subset=["Latitude", "Longitude"])
+
+    lats, lons, names, display_values, stresses, colors = (
+        markers[col].to_numpy() for col in ("Latitude", "Longitude", "Custom Name", "display_value", stress_column, "color")
+    )
+    features = [
+        {
+            "type": "Feature",
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+            "properties": {"name": name, "value": display_value, "stress": stress, "color": color},
         }
-        stations_list.append(station_info)
+        for lat, lon, name, display_value, stress, color in zip(lats, lons, names, display_values, stresses, colors)
+    ]
+    return {"type": "FeatureCollection", "features": features}
+
+
+# Station count above which markers are clustered instead of drawn individually
+MARKER_CLUSTER_THRESHOLD = 500
+
+# Client-side builder for clustered station markers; each row is [lat, lon, color, tooltip]
+CLUSTER_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.circleMarker(new L.LatLng(row[0], row[1]), {
+        radius: 15, color: "black", weight: 1, fillColor: row[2], fillOpacity: 0.7
+    });
+    marker.bindTooltip(row[3]);
+    return marker;
+}
+"""
 
-    return pd.DataFrame(stations_list)
 
-def get_color_scheme(value, indicator):
+def build_station_map(center_lat, center_lon, feature_collection, tooltip_fields, tooltip_aliases):
     """
-    Determines the color scheme for a given indicator value.
+    Builds a Folium map with all station markers drawn as a single canvas-rendered layer.
+
+    Up to MARKER_CLUSTER_THRESHOLD stations are drawn as one GeoJSON layer; larger networks
+    switch to a FastMarkerCluster whose markers are created in the browser.
 
     Args:
-        value (float or str): The value of the indicator. Can be a float or "N/A".
-        indicator (str): The name of the indicator (e.g., "Air Temperature (°C)", "Relative Humidity (%)").
+        center_lat (float): Latitude of the map center.
+        center_lon (float): Longitude of the map center.
+        feature_collection (dict): GeoJSON FeatureCollection with a "color" property per feature.
+        tooltip_fields (list): Feature properties shown in the tooltip.
+        tooltip_aliases (list): Labels for the tooltip fields.
 
     Returns:
-        str: The color corresponding to the value and indicator.
-    """
-    # Handle N/A values
-    if value == "N/A":
-        return "grey"  # Grey color for N/A values
-
-    # Color scheme based on the indicator type
-    if indicator == "Air Temperature (°C)":
-        if value <= 0:
-            return "darkblue"
-        elif value <= 10:
-            return "blue"
-        elif value <= 20:
-            return "lightgreen"
-        elif value <= 30:
-            return "yellow"
-        elif value <= 35:
-            return "orange"
-        elif value <= 40:
-            return "red"
-        else:
-            return "darkred"
+        folium.Map: The map with the station layer.
+    """
+    # Create a map using a tileset with English place names
+    # - `prefer_canvas`: Draws all circle markers on a single canvas instead of one DOM node per station.
+    m = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=9,
+        tiles="CartoDB Voyager",
+        prefer_canvas=True
+    )
 
-    elif indicator == "Relative Humidity (%)":
-        if value <= 40:
-            return "lightyellow"
-        elif value <= 60:
-            return "lightgreen"
-        else:
-            return "lightblue"
-
-    elif indicator == "Rain Last (mm)":
-        if value == 0:
-            return "white"
-        elif value <= 5:
-            return "lightblue"
-        elif value <= 10:
-            return "blue"
-        else:
-            return "darkblue"
+    features = feature_collection["features"]
+
+    if len(features) > MARKER_CLUSTER_THRESHOLD:
+        # Ship a flat list of rows and let the browser build only the visible markers
+        data = [
+            [
+                feature["geometry"]["coordinates"][1],
+                feature["geometry"]["coordinates"][0],
+                feature["properties"]["color"],
+                "<br>".join(
+                    f"{alias} {feature['properties'][field]}" for field, alias in zip(tooltip_fields, tooltip_aliases)
+                ),
+            ]
+            for feature in features
+        ]
+        FastMarkerCluster(data, callback=CLUSTER_MARKER_CALLBACK).add_to(m)
+        return m
+
+    folium.GeoJson(
+        feature_collection,
+        marker=folium.CircleMarker(radius=15),
+        style_function=lambda feature: {
+            "fillColor": feature["properties"]["color"],
+            "color": "black",
+            "weight": 1,
+            "fillOpacity": 0.7,
+        },
+        tooltip=folium.GeoJsonTooltip(fields=tooltip_fields, aliases=tooltip_aliases),
+    ).add_to(m)
+
+    return m
+
+
+# On-disk copies of the rendered station maps, reused across app restarts and workers
+STATION_MAP_CACHE_DIR = Path(".cache/maps")
+STATION_MAP_CACHE_MAX_FILES = 64  # Oldest maps are deleted beyond this
+
+
+def prune_station_map_cache():
+    """
+    Deletes the least recently used station maps beyond STATION_MAP_CACHE_MAX_FILES.
+    """
+    files = sorted(STATION_MAP_CACHE_DIR.glob("*.html"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in files[STATION_MAP_CACHE_MAX_FILES:]:
+        path.unlink(missing_ok=True)
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def render_station_map_html(center_lat, center_lon, feature_collection, tooltip_fields, tooltip_aliases):
+    """
+    Renders the station map to a standalone HTML document.
+
+    Recent maps are kept in memory, and every map is also written to a hash-keyed HTML file under
+    STATION_MAP_CACHE_DIR so repeat views survive restarts (the directory is pruned to the most recent maps).
+
+    Args:
+        center_lat (float): Latitude of the map center.
+        center_lon (float): Longitude of the map center.
+        feature_collection (dict): GeoJSON FeatureCollection with a "color" property per feature.
+        tooltip_fields (list): Feature properties shown in the tooltip.
+        tooltip_aliases (list): Labels for the tooltip fields.
+
+    Returns:
+        str: The HTML of the map.
+    """
+    # Key the file on all map inputs
+    key = hashlib.sha256(
+        orjson.dumps(
+            [center_lat, center_lon, feature_collection, tooltip_fields, tooltip_aliases],
+            option=orjson.OPT_SERIALIZE_NUMPY,
+            default=str,
+        )
+    ).hexdigest()
+    cache_path = STATION_MAP_CACHE_DIR / f"{key}.html"
+
+    # Reuse the rendered file, marking it as recently used for pruning
+    try:
+        html = cache_path.read_text(encoding="utf-8")
+        os.utime(cache_path)
+        return html
+    except OSError:
+        pass  # Not rendered yet or unreadable, render instead
+
+    m = build_station_map(center_lat, center_lon, feature_collection, tooltip_fields, tooltip_aliases)
+    html = m.get_root().render()
+
+    # Write to a temporary file first so readers never see a partial file
+    try:
+        STATION_MAP_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temp_path.write_text(html, encoding="utf-8")
+        os.replace(temp_path, cache_path)
+        prune_station_map_cache()
+    except OSError:
+        pass  # Caching is best effort, the rendered map is still returned
+
+    return html
+
+# SVG triangle marker with the temperature written inside, filled in with
+# (vertical offset, polygon points, color, text y position, text color, temperature)
+TRIANGLE_MARKER_TEMPLATE = """
+<div style="position: relative; transform: translate(0, %spx);">
+    <svg xmlns="http://www.w3.org/2000/svg" height="40" width="40" viewBox="0 0 40 40">
+        <polygon points="%s" style="fill:%s;stroke:black;stroke-width:1;fill-opacity:0.8;" />
+        <text x="50%%" y="%s%%" dominant-baseline="middle" text-anchor="middle" fill="%s" font-size="12" font-weight="bold">%s</text>
+    </svg>
+</div>
+"""
+
+# Temperature triangles, as (stats column, tooltip label, vertical offset, polygon points, text y position)
+TEMPERATURE_TRIANGLES = [
+    ("Max Temperature (°C)", "Max Temp", -20, "20,0 40,40 0,40", 70),
+    ("Min Temperature (°C)", "Min Temp", 20, "20,40 40,0 0,0", 30),
+]
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_temperature_map(temperature_stats, center_lat, center_lon):
+    """
+    Builds the Monthly Reports map with max (upward triangle) and min (downward triangle) temperatures per station.
+
+    The map is cached as a shared resource, so repeat views of the same month reuse the Folium objects.
+
+    Args:
+        temperature_stats (pd.DataFrame): Per-station metrics from compute_station_temperature_stats.
+        center_lat (float): Latitude of the map center.
+        center_lon (float): Longitude of the map center.
+
+    Returns:
+        folium.Map: The map with the temperature markers.
+    """
+    # Create a map with the bounds set dynamically
+    m = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=9,
+        tiles="CartoDB Voyager"  # Use CartoDB Positron tiles for English place names
+    )
+
+    # Collect the station markers in one layer and attach it to the map once
+    temperature_markers = folium.FeatureGroup(name="Stations", control=False)
+
+    # Stations without a match in station_status have no coordinates and are skipped
+    stations = temperature_stats.dropna(subset=["Latitude", "Longitude"])
+
+    # Pre-render the max and min triangle SVGs for all stations in one pass each
+    triangles = []
+    for column, label, offset, points, text_y in TEMPERATURE_TRIANGLES:
+        values = stations[column].to_numpy(dtype=float, na_value=np.nan)
+        colors = get_color_scheme_vectorized(values, "Air Temperature (°C)")
+        text_colors = np.where(np.isin(colors, ["blue", "darkblue", "darkred"]), "white", "black")  # Text color based on background color
+        html = [
+            None if np.isnan(value) else TRIANGLE_MARKER_TEMPLATE % (offset, points, color, text_y, text_color, int(value))
+            for value, color, text_color in zip(values, colors, text_colors)
+        ]
+        triangles.append((label, values, html))
+
+    # Add the upward (max) and downward (min) triangles of each station, where available
+    for i, (station_name, lat, lon) in enumerate(zip(stations.index, stations["Latitude"], stations["Longitude"])):
+        for label, values, html in triangles:
+            if html[i] is None:
+                continue
+            folium.Marker(
+                location=[lat, lon],  # Station's exact coordinates
+                icon=folium.DivIcon(html=html[i]),
+                tooltip=f"{station_name}<br>{label}: {int(values[i])}°C",
+            ).add_to(temperature_markers)
+
+    temperature_markers.add_to(m)
+
+    return m
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_temperature_days_map(temperature_stats, selected_option, center_lat, center_lon):
+    """
+    Builds the Monthly Reports map with circles sized by the number of hot or cold days per station.
+
+    The map is cached as a shared resource, so repeat views of the same month and option reuse the Folium objects.
+
+    Args:
+        temperature_stats (pd.DataFrame): Per-station metrics from compute_station_temperature_stats.
+        selected_option (str): "Hot Days" or "Cold Days".
+        center_lat (float): Latitude of the map center.
+        center_lon (float): Longitude of the map center.
+
+    Returns:
+        folium.Map: The map with the hot or cold day circles.
+    """
+    # Initialize the map
+    m_temperature_days = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=9,
+        tiles="CartoDB Voyager"  # Use CartoDB Positron tiles for English place names
+    )
 
-    elif indicator == "Wind Speed (m/s)":
-        if value <= 3:
-            return "lightgreen"
-        elif value <= 7:
-            return "yellow"
+    # Collect the station markers in one layer and attach it to the map once
+    temperature_day_markers = folium.FeatureGroup(name="Stations", control=False)
+
+    # Define the scaling factor for radius size
+    radius_factor = 400  # Adjust this factor for appropriate circle sizes
+
+    # Iterate through the weather stations to plot based on the selected option
+    for station_name, stats in temperature_stats.to_dict("index").items():
+        # Ensure data exists for the selected month
+        if stats["Rows"] == 0:
+            continue
+
+        # Skip if no matching station in station_status
+        if pd.isna(stats["Latitude"]) or pd.isna(stats["Longitude"]):
+            continue
+
+        lat = stats["Latitude"]
+        lon = stats["Longitude"]
+
+        # Skip if the relevant temperature column does not exist
+        if selected_option == "Hot Days" and not stats["Has Max Column"]:
+            continue
+        if selected_option == "Cold Days" and not stats["Has Min Column"]:
+            continue
+
+        # Hot or cold day counts
+        if selected_option == "Hot Days":
+            days_above_30 = int(stats["Days > 30°C"])
+            days_above_35 = int(stats["Days > 35°C"])
+            days_above_40 = int(stats["Days > 40°C"])
+        else:  # Cold Days
+            days_below_10 = int(stats["Days < 10°C"])
+            days_below_5 = int(stats["Days < 5°C"])
+            days_below_0 = int(stats["Days < 0°C"])
+
+        # Add circles based on the selected option
+        if selected_option == "Hot Days":
+            if days_above_30 > 0:
+                folium.Circle(
+                    location=[lat, lon],
+                    radius=days_above_30 * radius_factor,
+                    color="yellow",
+                    weight=0,
+                    fill=True,
+                    fill_color="yellow",
+                    fill_opacity=0.6,
+                    tooltip=f"{days_above_30} Days > 30°C",
+                ).add_to(temperature_day_markers)
+
+            if days_above_35 > 0:
+                folium.Circle(
+                    location=[lat, lon],
+                    radius=days_above_35 * radius_factor,
+                    color="orange",
+                    weight=0,
+                    fill=True,
+                    fill_color="orange",
+                    fill_opacity=0.6,
+                    tooltip=f"{days_above_35} Days > 35°C",
+                ).add_to(temperature_day_markers)
+
+            if days_above_40 > 0:
+                folium.Circle(
+                    location=[lat, lon],
+                    radius=days_above_40 * radius_factor,
+                    color="red",
+                    weight=0,
+                    fill=True,
+                    fill_color="red",
+                    fill_opacity=0.6,
+                    tooltip=f"{days_above_40} Days > 40°C",
+                ).add_to(temperature_day_markers)
+        else:  # Cold Days
+            if days_below_10 > 0:
+                folium.Circle(
+                    location=[lat, lon],
+                    radius=days_below_10 * radius_factor,
+                    color="lightblue",
+                    weight=0,
+                    fill=True,
+                    fill_color="lightblue",
+                    fill_opacity=0.6,
+                    tooltip=f"{days_below_10} Days < 10°C",
+                ).add_to(temperature_day_markers)
+
+            if days_below_5 > 0:
+                folium.Circle(
+                    location=[lat, lon],
+                    radius=days_below_5 * radius_factor,
+                    color="blue",
+                    weight=0,
+                    fill=True,
+                    fill_color="blue",
+                    fill_opacity=0.6,
+                    tooltip=f"{days_below_5} Days < 5°C",
+                ).add_to(temperature_day_markers)
+
+            if days_below_0 > 0:
+                folium.Circle(
+                    location=[lat, lon],
+                    radius=days_below_0 * radius_factor,
+                    color="darkblue",
+                    weight=0,
+                    fill=True,
+                    fill_color="darkblue",
+                    fill_opacity=0.6,
+                    tooltip=f"{days_below_0} Days < 0°C",
+                ).add_to(temperature_day_markers)
+
+        # Add a base black marker for the weather station with a tooltip
+        folium.CircleMarker(
+            location=[lat, lon],
+            radius=3,
+            color="black",
+            fill=True,
+            fill_color="black",
+            fill_opacity=1.0,
+            tooltip=station_name,
+        ).add_to(temperature_day_markers)
+
+    temperature_day_markers.add_to(m_temperature_days)
+
+    return m_temperature_days
+
+
+# SVG circle marker with the station value written inside, filled in with
+# (color, fill opacity, text color, value)
+CIRCLE_MARKER_TEMPLATE = """
+<div style="position: relative; transform: translate(-50%%, -50%%);">
+    <svg xmlns="http://www.w3.org/2000/svg" height="40" width="40" viewBox="0 0 40 40">
+        <circle cx="20" cy="20" r="15" style="fill:%s;stroke:black;stroke-width:1;fill-opacity:%s;" />
+        <text x="20" y="25" text-anchor="middle" fill="%s" font-size="14" font-weight="bold">%s</text>
+    </svg>
+</div>
+"""
+
+# Small black dot for stations without any precipitation
+ZERO_PRECIPITATION_MARKER = """
+<div style="position: relative; transform: translate(-50%, -50%);">
+    <svg xmlns="http://www.w3.org/2000/svg" height="20" width="20" viewBox="0 0 20 20">
+        <circle cx="10" cy="10" r="10" style="fill:black;stroke:grey;stroke-width:1;fill-opacity:1.0;" />
+        <text x="10" y="13" text-anchor="middle" fill="white" font-size="10" font-weight="bold">0</text>
+    </svg>
+</div>
+"""
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_precipitation_map(precipitation_stats, station_coordinates, center_lat, center_lon):
+    """
+    Builds the Monthly Reports map with the total monthly precipitation of each station.
+
+    Args:
+        precipitation_stats (dict): Per-station precipitation series from compute_precipitation_stats.
+        station_coordinates (dict): Latitude and Longitude of each station.
+        center_lat (float): Latitude of the map center.
+        center_lon (float): Longitude of the map center.
+
+    Returns:
+        folium.Map: The map with the precipitation markers.
+    """
+    # Monthly Total Precipitation Map
+    m_precip = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=9,
+        tiles="CartoDB Voyager"  # Use CartoDB Positron tiles for English place names
+    )
+
+    # Collect the station markers in one layer and attach it to the map once
+    precip_markers = folium.FeatureGroup(name="Stations", control=False)
+
+    # Total monthly precipitation and circle colors for all stations in one pass
+    totals = np.array([stats["total"] for stats in precipitation_stats.values()], dtype=float)
+    colors = get_color_scheme_vectorized(totals, "Rain Last (mm)")
+    text_colors = np.where(np.isin(colors, ["blue", "darkblue", "darkred"]), "white", "black")
+
+    # Loop through each station
+    for station_name, total_precip, precip_color, text_color in zip(precipitation_stats, totals, colors, text_colors):
+        coordinates = station_coordinates.get(station_name)
+        if coordinates is None:
+            continue
+
+        # Total monthly precipitation
+        display_precip = int(round(total_precip, 0))  # Round to nearest integer
+
+        lat = coordinates["Latitude"]
+        lon = coordinates["Longitude"]
+
+        if total_precip == 0:
+            # Add a small dot for stations with 0 precipitation
+            folium.Marker(
+                location=[lat, lon],
+                tooltip=f"{station_name}<br>Total Monthly Precipitation: {display_precip} mm",
+                icon=folium.DivIcon(html=ZERO_PRECIPITATION_MARKER),
+            ).add_to(precip_markers)
         else:
-            return "red"
+            # Add circle for stations with precipitation
+            folium.Marker(
+                location=[lat, lon],
+                tooltip=f"{station_name}<br>Total Monthly Precipitation: {display_precip} mm",
+                icon=folium.DivIcon(html=CIRCLE_MARKER_TEMPLATE % (precip_color, 0.6, text_color, display_precip)),
+            ).add_to(precip_markers)
+
+    precip_markers.add_to(m_precip)
+
+    return m_precip
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def build_wind_map(wind_speed_stats, selected_stat_col, statistic, fill_opacity, station_coordinates, center_lat, center_lon):
+    """
+    Builds a Monthly Reports map with a circle marker showing the selected wind speed statistic per station.
+
+    Args:
+        wind_speed_stats (pd.DataFrame): Monthly wind speeds in m/s indexed by station, with "avg", "max" and "gust" columns.
+        selected_stat_col (str): The wind speed column to display.
+        statistic (str): Label of the statistic, used in the tooltips.
+        fill_opacity (float): Fill opacity of the station circles.
+        station_coordinates (dict): Latitude and Longitude of each station.
+        center_lat (float): Latitude of the map center.
+        center_lon (float): Longitude of the map center.
+
+    Returns:
+        folium.Map: The map with the wind speed markers.
+    """
+    m = folium.Map(
+        location=[center_lat, center_lon],
+        zoom_start=9,
+        tiles="CartoDB Voyager"  # Use CartoDB Positron tiles for English place names
+    )
+
+    # Collect the station markers in one layer and attach it to the map once
+    wind_markers = folium.FeatureGroup(name="Stations", control=False)
+
+    # Colors for the wind values in m/s for all stations in one pass
+    wind_values = wind_speed_stats[selected_stat_col].to_numpy(dtype=float)
+    colors = get_color_scheme_vectorized(wind_values, "Wind Speed (m/s)")
+    text_colors = np.where(np.isin(colors, ["blue", "darkblue", "darkred"]), "white", "black")
+
+    # Add wind speed markers to the map
+    for station_name, wind_value, color, text_color in zip(wind_speed_stats.index, wind_values, colors, text_colors):
+        # Get station info
+        coordinates = station_coordinates.get(station_name)
+        if coordinates is None:
+            continue  # Skip stations without coordinates
+
+        lat = coordinates["Latitude"]
+        lon = coordinates["Longitude"]
+        if pd.isna(wind_value):
+            continue  # Skip if wind value is NaN
+
+        # Convert wind speed to km/h for display
+        wind_value_kmh = round(wind_value * 3.6, 0)  # 1 m/s = 3.6 km/h
+
+        # Add a CircleMarker with SVG icon for the station
+        folium.Marker(
+            location=[lat, lon],
+            tooltip=f"{station_name}<br>{statistic}: {wind_value_kmh:.0f} km/h",
+            icon=folium.DivIcon(html=CIRCLE_MARKER_TEMPLATE % (color, fill_opacity, text_color, int(wind_value_kmh))),
+        ).add_to(wind_markers)
+
+    wind_markers.add_to(m)
+
+    return m
 
-    # Default case if indicator doesn't match
-    return "grey"
 
 import streamlit as st
 
@@ -334,8 +1062,58 @@ def configure_sidebar(logo_path="./assets/logo_square.png", sidebar_width=200):
 
 
 
+import streamlit as st
 import pandas as pd
-from pythermalcomfort.models import utci, heat_index
+import numpy as np
+
+# Wind speed adjustment from the 2m measurement height to the 10m UTCI reference height (power law, alpha = 0.14)
+WIND_10M_FACTOR = (10 / 2) ** 0.14
+
+# Solar radiation to mean radiant temperature term: absorptivity for skin (0.7) x view factor for
+# outdoor exposure (0.5) / Stefan-Boltzmann constant (5.67e-8)
+SOLAR_RADIATION_COEFFICIENT = 0.7 * 0.5 / 5.67e-8
+
+@lru_cache(maxsize=None)
+def load_thermal_comfort_models():
+    """
+    Imports the pythermalcomfort models on first use, so pages without indices don't pay for loading the package.
+
+    Returns:
+        tuple: The utci and heat_index functions.
+    """
+    from pythermalcomfort.models import utci, heat_index
+    return utci, heat_index
+
+
+# UTCI stress categories, as left-closed bins and their labels
+UTCI_STRESS_BINS = [-np.inf, 26, 32, 38, 46, np.inf]
+UTCI_STRESS_LABELS = ["No heat stress", "Moderate heat stress", "Strong heat stress", "Very strong heat stress", "Extreme heat stress"]
+
+# Heat Index stress categories (°C), as left-closed bins and their labels
+HEAT_INDEX_STRESS_BINS = [-np.inf, 26.7, 32.2, 39.4, 51.1, np.inf]
+HEAT_INDEX_STRESS_LABELS = ["No heat stress", "Caution", "Extreme Caution", "Danger", "Extreme Danger"]
+
+# Categorical dtypes of the stress columns, so each row stores a small integer code instead of a string
+UTCI_STRESS_DTYPE = pd.CategoricalDtype(UTCI_STRESS_LABELS + ["N/A"])
+HEAT_INDEX_STRESS_DTYPE = pd.CategoricalDtype(HEAT_INDEX_STRESS_LABELS + ["N/A"])
+
+
+def categorize_stress(values, bins, labels):
+    """
+    Bins values into stress categories in one vectorized pass.
+
+    Args:
+        values (float or array-like): The index value(s).
+        bins (list): Left-closed bin edges.
+        labels (list): The category of each bin.
+
+    Returns:
+        str or np.ndarray: The category of each value, with "N/A" for missing values.
+    """
+    values_array = np.atleast_1d(np.asarray(values, dtype=float))
+    categories = pd.cut(values_array, bins=bins, labels=labels, right=False).astype(object)
+    categories = np.where(pd.isna(categories), "N/A", categories).astype(object)
+    return categories[0] if np.ndim(values) == 0 else categories
 
 # Function to categorize UTCI stress
 def categorize_utci(utci_value):
@@ -343,23 +1121,12 @@ def categorize_utci(utci_value):
     Categorize UTCI stress levels based on UTCI value.
 
     Args:
-        utci_value (float): The UTCI value.
+        utci_value (float or array-like): The UTCI value(s).
 
     Returns:
-        str: Stress category based on UTCI value.
+        str or np.ndarray: Stress category based on UTCI value.
     """
-    if utci_value < 26:
-        return "No heat stress"
-    elif 26 <= utci_value < 32:
-        return "Moderate heat stress"
-    elif 32 <= utci_value < 38:
-        return "Strong heat stress"
-    elif 38 <= utci_value < 46:
-        return "Very strong heat stress"
-    elif utci_value >= 46:
-        return "Extreme heat stress"
-    else:
-        return "N/A"
+    return categorize_stress(utci_value, UTCI_STRESS_BINS, UTCI_STRESS_LABELS)
 
 # Function to categorize Heat Index stress
 def categorize_heat_index(hi_value):
@@ -367,98 +1134,212 @@ def categorize_heat_index(hi_value):
     Categorize Heat Index stress levels based on Heat Index value.
 
     Args:
-        hi_value (float): The Heat Index value in Celsius.
+        hi_value (float or array-like): The Heat Index value(s) in Celsius.
 
     Returns:
-        str: Stress category based on Heat Index value.
+        str or np.ndarray: Stress category based on Heat Index value.
     """
-    if hi_value < 26.7:
-        return "No heat stress"
-    elif 26.7 <= hi_value < 32.2:
-        return "Caution"
-    elif 32.2 <= hi_value < 39.4:
-        return "Extreme Caution"
-    elif 39.4 <= hi_value < 51.1:
-        return "Danger"
-    elif hi_value >= 51.1:
-        return "Extreme Danger"
-    else:
-        return "N/A"
+    return categorize_stress(hi_value, HEAT_INDEX_STRESS_BINS, HEAT_INDEX_STRESS_LABELS)
+
 
-def calculate_indices(row):
+def calculate_indices_vectorized(df):
     """
-    Calculate UTCI and Heat Index for a given station, handling missing data gracefully.
+    Calculate UTCI and Heat Index for all stations at once, handling missing data gracefully.
+
+    Every step runs over whole columns and pythermalcomfort evaluates the UTCI and
+    Heat Index polynomials over the arrays.
 
     Args:
-        row (pd.Series): A row from the DataFrame containing station data.
+        df (pd.DataFrame): DataFrame containing station data, one row per station.
 
     Returns:
-        pd.Series: A series with calculated indices and stress categories or N/A for missing data.
+        pd.DataFrame: Calculated indices and stress categories, indexed like df, with N/A for missing data.
     """
-    try:
-        # Extract values and handle missing data
-        tdb = row.get('Air Temperature (°C)', None)
-        rh = row.get('Relative Humidity (%)', None)
-        v_2m = row.get('Wind Speed (m/s)', None)
-        if v_2m is not None and v_2m < 0.4: # edit because package doesn't work with speeds below 0.4m/s
-            v_2m = 0.4
-        solar_radiation = row.get('Solar Radiation (W/m²)', None)
-
-        # Check for missing essential data
-        if pd.isna(tdb) or pd.isna(rh) or pd.isna(v_2m):
-            return pd.Series({
-                'UTCI': 'N/A',
-                'Heat Index': 'N/A',
-                'UTCI Stress': 'N/A',
-                'Heat Index Stress': 'N/A'
-            })
-
-        # Convert relative humidity to a fraction
-        rh /= 100
-
-        # Adjust wind speed to 10m
-        z_measured = 2
-        z_target = 10
-        alpha = 0.14
-        v_10m = v_2m * (z_target / z_measured) ** alpha
-
-        # Calculate mean radiant temperature (handle missing solar radiation)
-        if pd.isna(solar_radiation):
-            solar_radiation = 0  # Assume no solar radiation if missing
-        sigma = 5.67e-8  # Stefan-Boltzmann constant
-        a = 0.7  # Absorptivity for skin
-        f = 0.5  # View factor for outdoor exposure
-        tdb_k = tdb + 273.15
-        tr_k = ((tdb_k ** 4) + (solar_radiation * a * f / sigma)) ** 0.25
-        tr = tr_k - 273.15
-
-        # Calculate UTCI and Heat Index
-        utci_value = utci(tdb=tdb, tr=tr, v=v_10m, rh=rh)
-        hi_value = heat_index(tdb=tdb, rh=rh)
-
-        # Determine stress categories
-        utci_category = categorize_utci(utci_value)
-        hi_category = categorize_heat_index(hi_value)
-
-        return pd.Series({
-            'UTCI': utci_value,
-            'Heat Index': hi_value,
-            'UTCI Stress': utci_category,
-            'Heat Index Stress': hi_category
-        })
-    except Exception as e:
-        # Handle unexpected errors gracefully
-        return pd.Series({
-            'UTCI': 'N/A',
-            'Heat Index': 'N/A',
-            'UTCI Stress': 'N/A',
-            'Heat Index Stress': 'N/A'
-        })
+    # Extract values as arrays, treating anything non-numeric as missing
+    tdb = pd.to_numeric(df['Air Temperature (°C)'], errors='coerce').to_numpy(dtype=float)
+    rh = pd.to_numeric(df['Relative Humidity (%)'], errors='coerce').to_numpy(dtype=float)
+    v_2m = pd.to_numeric(df['Wind Speed (m/s)'], errors='coerce').to_numpy(dtype=float)
+    v_2m = np.where(v_2m < 0.4, 0.4, v_2m)  # edit because package doesn't work with speeds below 0.4m/s
+    solar_radiation = pd.to_numeric(df['Solar Radiation (W/m²)'], errors='coerce').to_numpy(dtype=float)
+
+    # Rows missing essential data are reported as N/A
+    valid = ~(np.isnan(tdb) | np.isnan(rh) | np.isnan(v_2m))
+
+    # Convert relative humidity to a fraction
+    rh = rh / 100
+
+    # Adjust wind speed to 10m
+    v_10m = v_2m * WIND_10M_FACTOR
+
+    # Calculate mean radiant temperature (assume no solar radiation if missing)
+    solar_radiation = np.nan_to_num(solar_radiation, nan=0.0)
+    tdb_k = tdb + 273.15
+    tr_k = ((tdb_k ** 4) + (solar_radiation * SOLAR_RADIATION_COEFFICIENT)) ** 0.25
+    tr = tr_k - 273.15
+
+    # Calculate UTCI and Heat Index only for stations with complete data,
+    # passing contiguous float64 arrays to pythermalcomfort's polynomials
+    utci_values = np.full(tdb.shape, np.nan)
+    hi_values = np.full(tdb.shape, np.nan)
+    if valid.any():
+        utci, heat_index = load_thermal_comfort_models()
+        utci_values[valid] = utci(tdb=tdb[valid], tr=tr[valid], v=v_10m[valid], rh=rh[valid])
+        hi_values[valid] = heat_index(tdb=tdb[valid], rh=rh[valid])
+
+    # Determine stress categories for all stations at once
+    utci_category = categorize_utci(utci_values)
+    hi_category = categorize_heat_index(hi_values)
+
+    results = pd.DataFrame({
+        'UTCI': utci_values,
+        'Heat Index': hi_values,
+    }, index=df.index).astype(object)
+
+    # Rows with missing data are N/A (their stress categories are already N/A)
+    results.loc[~valid] = 'N/A'
+    results['UTCI Stress'] = pd.Categorical(utci_category, dtype=UTCI_STRESS_DTYPE)
+    results['Heat Index Stress'] = pd.Categorical(hi_category, dtype=HEAT_INDEX_STRESS_DTYPE)
+    return results
+
+
+@st.cache_data(show_spinner=False, ttl=300)
+def compute_hazard_df(station_status, required_columns):
+    """
+    Combines the required station columns with the calculated UTCI and Heat Index values.
+
+    Args:
+        station_status (pd.DataFrame): Processed station data.
+        required_columns (list): Station columns to keep alongside the indices.
+
+    Returns:
+        pd.DataFrame: Station data with indices and stress categories.
+    """
+    return pd.concat([station_status[required_columns], calculate_indices_vectorized(station_status)], axis=1)
 
 
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+import bottleneck as bn
 import urllib.parse
+import io
+import time
+
+# Maximum number of station sheets downloaded at the same time (matches the shared session's connection pool,
+# so every sheet's request is in flight at once and the batch takes about one Sheets round trip)
+HISTORIC_FETCH_WORKERS = HTTP_POOL_SIZE
+
+# On-disk Parquet copies of the station sheets, reused across app restarts and workers
+HISTORIC_CACHE_DIR = Path(".cache/historic")
+HISTORIC_CACHE_TTL = 3600  # Seconds
+
+
+def historic_types_mapper(arrow_type):
+    """
+    Maps the Arrow columns of a station sheet to Arrow-backed pandas dtypes.
+
+    Timestamps are left to the default conversion so "Date/Time" stays a datetime64 column for date indexing.
+
+    Args:
+        arrow_type (pa.DataType): The Arrow type of a column.
+
+    Returns:
+        pd.ArrowDtype | None: The pandas dtype to use, or None for the default conversion.
+    """
+    if pa.types.is_timestamp(arrow_type):
+        return None
+    return pd.ArrowDtype(arrow_type)
+
+
+def historic_table_to_pandas(table):
+    """
+    Converts a station sheet read by pyarrow to pandas, with the same dtypes for downloads and cached copies.
+
+    Args:
+        table (pa.Table): The station sheet.
+
+    Returns:
+        pd.DataFrame: The station's historic data, with "Date/Time" parsed if present.
+    """
+    df = table.to_pandas(types_mapper=historic_types_mapper, coerce_temporal_nanoseconds=True)
+    # Parse dates once so pages can filter without reparsing strings (pyarrow only infers ISO timestamps)
+    if "Date/Time" in df.columns and not pd.api.types.is_datetime64_dtype(df["Date/Time"]):
+        df["Date/Time"] = pd.to_datetime(df["Date/Time"].astype(object), errors="coerce")
+    return df
+
+
+def fetch_historic_sheet(base_url, station):
+    """
+    Downloads the historic data sheet of a single station, using the on-disk Parquet cache when it is fresh.
+
+    Args:
+        base_url (str): Google Sheets CSV export URL, without the sheet name.
+        station (str): The station name, which is also the sheet name.
+
+    Returns:
+        pd.DataFrame: The station's historic data, with "Date/Time" parsed if present.
+    """
+    cache_path = HISTORIC_CACHE_DIR / f"{urllib.parse.quote(station.strip(), safe='')}.parquet"
+
+    # Reuse the cached copy if it was written within the TTL
+    try:
+        if time.time() - cache_path.stat().st_mtime < HISTORIC_CACHE_TTL:
+            return historic_table_to_pandas(pq.read_table(cache_path))
+    except (OSError, pa.ArrowException):
+        pass  # Missing or unreadable cache, download instead
+
+    sanitized_name = urllib.parse.quote(station.strip())
+    url = base_url + sanitized_name
+    response = get_http_session().get(url, timeout=60)
+    response.raise_for_status()
+    # Parse with Arrow's multithreaded CSV reader straight from the response bytes
+    df = historic_table_to_pandas(pa_csv.read_csv(io.BytesIO(response.content)))
+
+    # Write to a temporary file first so readers never see a partial file
+    try:
+        HISTORIC_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        df.to_parquet(temp_path, engine="pyarrow", compression="zstd", index=False)
+        os.replace(temp_path, cache_path)
+    except (OSError, pa.ArrowException):
+        pass  # Caching is best effort, the downloaded data is still returned
+
+    return df
+
+
+@st.cache_data(show_spinner=False, ttl=3600)
+def download_historic_sheets(base_url, station_names):
+    """
+    Downloads the historic data sheets of all stations concurrently.
+
+    Args:
+        base_url (str): Google Sheets CSV export URL, without the sheet name.
+        station_names (tuple): The station names to download.
+
+    Returns:
+        tuple: A dict of DataFrames for the stations that loaded, and a dict of error messages for those that did not.
+    """
+    def fetch(station):
+        try:
+            return station, fetch_historic_sheet(base_url, station), None
+        except Exception as e:
+            return station, None, str(e)
+
+    historic_dataframes = {}
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(HISTORIC_FETCH_WORKERS, len(station_names)))) as executor:
+        for station, df, error in executor.map(fetch, station_names):
+            if error is None:
+                historic_dataframes[station] = df
+            else:
+                errors[station] = error
+
+    return historic_dataframes, errors
+
 
 def fetch_historic_data(station_status):
     """
@@ -492,20 +1373,13 @@ def fetch_historic_data(station_status):
 
     station_names = station_status["Custom Name"].unique()
 
-    # Dictionary to hold DataFrames for each station
-    historic_dataframes = {}
+    # Fetch the data for all stations concurrently (cached across sessions)
+    historic_dataframes, errors = download_historic_sheets(base_url, tuple(station_names))
 
-    # Fetch and store data for each station
-    for station in station_names:
-        try:
-            sanitized_name = urllib.parse.quote(station.strip())
-            url = base_url + sanitized_name
-            df = pd.read_csv(url)
-            historic_dataframes[station] = df
-        except Exception as e:
-            # Clear the loading message
-            loading_message.empty()
-            st.warning(f"Could not load data for {station}: {e}")
+    for station, error in errors.items():
+        # Clear the loading message
+        loading_message.empty()
+        st.warning(f"Could not load data for {station}: {error}")
 
     # Save the fetched data to session state
     st.session_state["historic_dataframes"] = historic_dataframes
@@ -516,21 +1390,347 @@ def fetch_historic_data(station_status):
     return historic_dataframes
 
 
-def func_historic_averages():
+@st.cache_data(show_spinner=False, ttl=300)
+def get_latest_historic_date(historic_dataframes):
+    """
+    Returns the most recent date across all historic station data.
+
+    Args:
+        historic_dataframes (dict): Historic data as DataFrames for each station.
+
+    Returns:
+        datetime.date: The latest "Date/Time" value.
+    """
+    return max(df['Date/Time'].max() for df in historic_dataframes.values()).date()
 
-    # Create the dataframe with the given data
-    data = pd.DataFrame({
-        "Month": [
-            "January", "February", "March", "April", "May", "June",
-            "July", "August", "September", "October", "November", "December"
-        ],
-        "Temp_Avg": [7.24, 9.00, 12.70, 17.56, 22.60, 27.29, 30.04, 29.94, 26.59, 21.25, 14.25, 8.98],
-        "Temp_Max": [11.65, 13.86, 18.18, 23.80, 29.39, 34.39, 37.16, 36.94, 33.50, 27.58, 19.72, 13.52],
-        "Temp_Min": [2.8, 4.2, 7.2, 11.3, 15.8, 20.2, 23.0, 22.9, 19.7, 14.9, 8.7, 4.4],
-        "Precipitation_Total": [41.49, 36.92, 33.48, 21.75, 13.39, 1.64, 0.51, 0.55, 2.30, 15.85, 26.51, 35.92]
-    })
 
-    return data
+@st.cache_data(show_spinner=False, ttl=3600)
+def prepare_historic_frames(historic_dataframes):
+    """
+    Indexes each station's historic data by date so date ranges can be sliced with `.loc`.
+
+    Rows without a valid date are dropped and the "Date/Time" column is kept alongside the index.
+    Stations without a "Date/Time" column are left out. Column dtypes are kept as loaded.
+
+    Args:
+        historic_dataframes (dict): Historic data as DataFrames for each station.
+
+    Returns:
+        dict: DataFrames for each station with a sorted DatetimeIndex.
+    """
+    prepared_frames = {}
+    for station, df in historic_dataframes.items():
+        if "Date/Time" not in df.columns:
+            continue
+
+        prepared_frames[station] = (
+            df.dropna(subset=["Date/Time"])
+            .set_index("Date/Time", drop=False)
+            .rename_axis(None)
+            .sort_index()
+        )
+
+    return prepared_frames
+
+
+@st.cache_resource(show_spinner=False)
+def build_historic_table(historic_dataframes):
+    """
+    Combines the historic data of all stations into a single long-form Arrow table.
+
+    Rows are sorted by "Date/Time" (rows without a valid date are dropped) so that
+    date ranges can be located with a binary search.
+
+    Args:
+        historic_dataframes (dict): Historic data as DataFrames for each station.
+
+    Returns:
+        pa.Table: All station rows with a "Station" column, sorted by "Date/Time".
+    """
+    # Value columns are coerced to float64 (text cells become nulls) so every station has the same column types
+    tables = [
+        pa.Table.from_pandas(
+            df.assign(
+                **{
+                    col: pd.to_numeric(df[col], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+                    for col in df.columns
+                    if col != "Date/Time"
+                },
+                Station=station,
+            ),
+            preserve_index=False,
+        )
+        for station, df in historic_dataframes.items()
+        if "Date/Time" in df.columns
+    ]
+    if not tables:
+        return pa.table({"Station": pa.array([], pa.string()), "Date/Time": pa.array([], pa.timestamp("ns"))})
+
+    # Columns missing for a station are filled with nulls
+    table = pa.concat_tables(tables, promote_options="permissive")
+    table = table.filter(pc.is_valid(table["Date/Time"])).sort_by("Date/Time")
+    return table.combine_chunks()
+
+
+@st.cache_data(show_spinner=False)
+def get_temperature_columns(historic_dataframes):
+    """
+    Finds each station's "Air temperature (max|avg|min)" columns once, so pages don't rescan the columns.
+
+    Args:
+        historic_dataframes (dict): Historic data as DataFrames for each station.
+
+    Returns:
+        dict: For each station, a dict mapping "max", "avg" and "min" to the matching column name (or None).
+    """
+    return {
+        station_name: {
+            key: next((col for col in df.columns if f"Air temperature ({key})" in col), None)
+            for key in ("max", "avg", "min")
+        }
+        for station_name, df in historic_dataframes.items()
+    }
+
+
+# Daily temperature aggregate columns, as (output column, temperature type, reduction)
+DAILY_TEMPERATURE_AGGREGATES = [
+    ("Min_Low", "min", "min"), ("Min_High", "min", "max"), ("Min_Avg", "min", "mean"),
+    ("Avg_Low", "avg", "min"), ("Avg_High", "avg", "max"), ("Avg_Avg", "avg", "mean"),
+    ("Max_Low", "max", "min"), ("Max_High", "max", "max"), ("Max_Avg", "max", "mean"),
+]
+
+
+@st.cache_data(show_spinner=False)
+def compute_daily_temperature_aggregates(filtered_dataframes, temperature_columns):
+    """
+    Aggregates the daily minimum, average and maximum air temperatures across all stations.
+
+    Each station's "Air temperature (min|avg|max)" columns are copied into one pre-allocated
+    float32 buffer (one row per station-day) and grouped by day. Days missing any of the three
+    temperature types are dropped.
+
+    Args:
+        filtered_dataframes (dict): Historic data as DataFrames for each station.
+        temperature_columns (dict): Temperature column names for each station, from get_temperature_columns.
+
+    Returns:
+        pd.DataFrame: One row per day with a "Date" column and the DAILY_TEMPERATURE_AGGREGATES columns.
+    """
+    output_columns = ["Date"] + [column for column, _, _ in DAILY_TEMPERATURE_AGGREGATES]
+    keys = ["min", "avg", "max"]
+
+    total_rows = sum(len(df) for df in filtered_dataframes.values())
+    if total_rows == 0:
+        return pd.DataFrame(columns=output_columns)
+
+    # Fill the buffers station by station; missing temperature columns stay NaN
+    dates = np.empty(total_rows, dtype="datetime64[ns]")
+    temperatures = np.full((total_rows, len(keys)), np.nan, dtype=np.float32)
+    offset = 0
+    for station_name, df in filtered_dataframes.items():
+        end = offset + len(df)
+        dates[offset:end] = df["Date/Time"].dt.normalize().to_numpy()
+        for i, key in enumerate(keys):
+            matching_col = temperature_columns[station_name][key]
+            if matching_col:
+                temperatures[offset:end, i] = pd.to_numeric(df[matching_col], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan)
+        offset = end
+
+    long_df = pd.DataFrame(temperatures, columns=keys).assign(Date=dates)
+    daily_aggregates_df = long_df.groupby("Date").agg(
+        **{column: (key, reduction) for column, key, reduction in DAILY_TEMPERATURE_AGGREGATES}
+    )
+    return daily_aggregates_df.dropna().reset_index()[output_columns]
+
+
+# Hot and cold day counts per temperature column, as (comparison, thresholds, output columns)
+HOT_COLD_DAY_COUNTS = {
+    "max": (np.greater, [30, 35, 40], ["Days > 30°C", "Days > 35°C", "Days > 40°C"]),
+    "min": (np.less, [10, 5, 0], ["Days < 10°C", "Days < 5°C", "Days < 0°C"]),
+}
+
+
+@st.cache_data(show_spinner=False)
+def compute_station_temperature_stats(filtered_dataframes, station_status, temperature_columns):
+    """
+    Computes the monthly temperature metrics of each station once for all report sections.
+
+    Args:
+        filtered_dataframes (dict): Historic data for the selected month as DataFrames for each station.
+        station_status (pd.DataFrame): Station data with "Custom Name", "Latitude" and "Longitude".
+        temperature_columns (dict): Temperature column names for each station, from get_temperature_columns.
+
+    Returns:
+        pd.DataFrame: One row per station (indexed by name) with the row count, whether the max/min
+        temperature columns exist, the rounded max/min temperatures, the HOT_COLD_DAY_COUNTS columns
+        and the station coordinates. Metrics that cannot be computed are missing (<NA>).
+    """
+    integer_columns = ["Max Temperature (°C)", "Min Temperature (°C)"] + [
+        column for _, _, count_columns in HOT_COLD_DAY_COUNTS.values() for column in count_columns
+    ]
+    columns = ["Station", "Rows", "Has Max Column", "Has Min Column"] + integer_columns
+
+    stats = []
+    for station_name, df in filtered_dataframes.items():
+        temperatures = {}
+        for key in ("max", "min"):
+            matching_col = temperature_columns[station_name][key]
+            # float32 is ample for the temperature statistics (< 0.1 °C precision)
+            temperatures[key] = pd.to_numeric(df[matching_col], errors="coerce").to_numpy(dtype=np.float32, na_value=np.nan) if matching_col else None
+
+        row = {
+            "Station": station_name,
+            "Rows": len(df),
+            "Has Max Column": temperatures["max"] is not None,
+            "Has Min Column": temperatures["min"] is not None,
+        }
+        for column, key, reduction in [("Max Temperature (°C)", "max", np.nanmax), ("Min Temperature (°C)", "min", np.nanmin)]:
+            values = temperatures[key]
+            row[column] = int(round(reduction(values), 0)) if values is not None and not np.isnan(values).all() else None
+        for key, (comparison, thresholds, count_columns) in HOT_COLD_DAY_COUNTS.items():
+            values = temperatures[key]
+            if values is None:
+                row.update(dict.fromkeys(count_columns))
+                continue
+            # Compare against all thresholds at once: (days, 1) vs (thresholds,) -> one count per threshold
+            counts = np.count_nonzero(comparison(values[:, np.newaxis], thresholds), axis=0)
+            row.update(zip(count_columns, counts.tolist()))
+        stats.append(row)
+
+    stats_df = pd.DataFrame(stats, columns=columns).set_index("Station")
+    stats_df = stats_df.astype({column: "Int16" for column in integer_columns})
+
+    # Coordinates of the first matching station
+    coordinates = station_status.drop_duplicates("Custom Name").set_index("Custom Name")[["Latitude", "Longitude"]]
+    return stats_df.join(coordinates)
+
+
+@st.cache_data(show_spinner=False)
+def compute_precipitation_stats(filtered_dataframes):
+    """
+    Computes the daily, 5-day cumulative and total precipitation of each station once for all report sections.
+
+    The stations' series are packed into one (stations x days) matrix, padded with NaN at the end,
+    so the window sums, totals and maxima are each a single NumPy call over all stations.
+
+    Args:
+        filtered_dataframes (dict): Historic data for the selected month as DataFrames for each station.
+
+    Returns:
+        dict: For each station with a "Precipitation (sum)" column, a dict with the "dates", "daily" and
+        "cumulative_5_day" arrays and the "total" and "max_cumulative_5_day" values.
+    """
+    # Skip stations where precipitation data is unavailable
+    stations = [
+        (station_name, df) for station_name, df in filtered_dataframes.items() if "Precipitation (sum)" in df.columns
+    ]
+    if not stations:
+        return {}
+
+    # One contiguous row per station, so each station's series is a plain slice of the matrices
+    lengths = [len(df) for _, df in stations]
+    dates = np.full((len(stations), max(lengths)), np.datetime64("NaT"), dtype="datetime64[ns]")
+    precipitation = np.full((len(stations), max(lengths)), np.nan, dtype=np.float32)  # float32 is ample for daily mm
+    for row, (_, df) in enumerate(stations):
+        dates[row, :len(df)] = df["Date/Time"].to_numpy(dtype="datetime64[ns]")
+        precipitation[row, :len(df)] = df["Precipitation (sum)"].to_numpy(dtype=np.float32, na_value=np.nan)
+
+    # 5-day running sums, skipping NaN values like rolling(5, min_periods=1).sum()
+    # - The NaN padding only follows each station's values, so it never enters an earlier window.
+    # - bottleneck rejects windows longer than the series, which a shorter window sums identically.
+    window = min(5, precipitation.shape[1])
+    cumulative_5_day = bn.move_sum(precipitation, window=window, min_count=1, axis=1) if window else precipitation.copy()
+    totals = np.nansum(precipitation, axis=1)
+    max_cumulative_5_day = np.fmax.reduce(cumulative_5_day, axis=1, initial=np.nan)  # NaN if a station has no values
+
+    return {
+        station_name: {
+            "dates": dates[row, :length],
+            "daily": precipitation[row, :length],
+            "cumulative_5_day": cumulative_5_day[row, :length],
+            "total": totals[row],
+            "max_cumulative_5_day": max_cumulative_5_day[row],
+        }
+        for row, ((station_name, _), length) in enumerate(zip(stations, lengths))
+    }
+
+
+# Wind speed column variants for each statistic, in order of preference
+WIND_COLUMNS = {
+    "avg": ["U-sonic wind speed (avg)", "Wind speed (avg)"],
+    "max": ["U-sonic wind speed (max)", "Wind speed (max)"],
+    "gust": ["Wind gust (max)"],
+}
+
+
+@st.cache_data(show_spinner=False)
+def get_wind_columns(historic_dataframes):
+    """
+    Resolves each station's wind speed column variants once, so the wind sections don't rescan the columns.
+
+    Args:
+        historic_dataframes (dict): Historic data as DataFrames for each station.
+
+    Returns:
+        dict: For each station, a dict mapping "avg", "max" and "gust" to the matching column name (or None).
+    """
+    return {
+        station_name: {
+            key: next((col for col in column_variants if col in df.columns), None)
+            for key, column_variants in WIND_COLUMNS.items()
+        }
+        for station_name, df in historic_dataframes.items()
+    }
+
+
+@st.cache_data(show_spinner=False)
+def compute_wind_stats(filtered_dataframes, wind_columns):
+    """
+    Computes the monthly wind speed statistics of each station once for all wind sections.
+
+    Args:
+        filtered_dataframes (dict): Historic data for the selected month as DataFrames for each station.
+        wind_columns (dict): Each station's wind speed columns, from get_wind_columns.
+
+    Returns:
+        pd.DataFrame: The mean and max of the daily values in m/s, indexed by station, with
+        ("avg" | "max" | "gust", "mean" | "max") columns. Statistics without a matching column are NaN.
+    """
+    # Rename each station's wind columns to the canonical "avg", "max" and "gust" names
+    station_frames = {}
+    for station_name, df in filtered_dataframes.items():
+        columns = {key: col for key, col in wind_columns.get(station_name, {}).items() if col}
+        station_frames[station_name] = pd.DataFrame(
+            {key: pd.to_numeric(df[col], errors="coerce") for key, col in columns.items()}, index=df.index
+        )
+
+    if not station_frames:
+        return pd.DataFrame(columns=pd.MultiIndex.from_product([list(WIND_COLUMNS), ["mean", "max"]]), dtype="float32")
+
+    # Stack all stations into one long frame and reduce it in a single groupby (float32 is ample for m/s)
+    wind_long = pd.concat(station_frames, names=["Station", "Date"]).reindex(columns=list(WIND_COLUMNS)).astype("float32")
+    # Aggregate in float32, then widen to float64 so build_wind_prompt's .round(1) yields short decimals
+    # (rounding float32 values and widening them afterwards would print 12.300000190734863, not 12.3)
+    return wind_long.groupby(level="Station", sort=False).agg(["mean", "max"]).astype("float64")
+
+
+# Country-wide historic monthly averages, built once at import
+HISTORIC_AVERAGES = pd.DataFrame({
+    "Month": [
+        "January", "February", "March", "April", "May", "June",
+        "July", "August", "September", "October", "November", "December"
+    ],
+    "Temp_Avg": [7.24, 9.00, 12.70, 17.56, 22.60, 27.29, 30.04, 29.94, 26.59, 21.25, 14.25, 8.98],
+    "Temp_Max": [11.65, 13.86, 18.18, 23.80, 29.39, 34.39, 37.16, 36.94, 33.50, 27.58, 19.72, 13.52],
+    "Temp_Min": [2.8, 4.2, 7.2, 11.3, 15.8, 20.2, 23.0, 22.9, 19.7, 14.9, 8.7, 4.4],
+    "Precipitation_Total": [41.49, 36.92, 33.48, 21.75, 13.39, 1.64, 0.51, 0.55, 2.30, 15.85, 26.51, 35.92]
+})
+
+
+def func_historic_averages():
+
+    # Shared module-level table (callers only read it, so no copy is made)
+    return HISTORIC_AVERAGES
 
 def generate_chart_prompt(data: pd.DataFrame, selected_month, chart_title: str, instructions: str):
     """
@@ -549,4 +1749,113 @@ def generate_chart_prompt(data: pd.DataFrame, selected_month, chart_title: str,
 4. Strictly avoid making unwarranted inferences or assumptions and ensure observations are strictly based on the data. Maintain a professional tone and, avoid generic phrases, repetition or alarmist statements.
 5. {instructions}
 
-{data.to_string(index=False)}"""
+{data.to_csv(index=False)}"""
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_precipitation_prompt(precipitation_stats, selected_month, historic_precip_total):
+    """
+    Builds the ChatGPT prompt for the monthly precipitation analysis.
+
+    Args:
+        precipitation_stats (dict): Per-station precipitation series from compute_precipitation_stats.
+        selected_month (str): The selected month, e.g. "December 2024".
+        historic_precip_total (float or None): Country-wide historic precipitation total for the month.
+
+    Returns:
+        str: The prompt text.
+    """
+    # Prepare combined data for the prompt
+    precipitation_data = []
+
+    for station_name, stats in precipitation_stats.items():
+        # Append precipitation data, with the daily series rendered straight from the arrays as comma-separated text
+        precipitation_data.append({
+            "Station": station_name,
+            # The float32 sums are widened and rounded to 0.1 mm (e.g. 12.3, not 12.300000190734863)
+            "Total Precipitation (mm)": round(float(stats["total"]), 1),
+            "Max 5-Day Cumulative Precipitation (mm)": round(float(stats["max_cumulative_5_day"]), 1),
+            "Daily Precipitation (mm)": ", ".join(stats["daily"].astype(str)),
+            "Dates": ", ".join(np.datetime_as_string(stats["dates"], unit="D")),
+        })
+
+    # Convert to a DataFrame for the prompt
+    precip_analysis_df = pd.DataFrame(precipitation_data)
+
+    # Generate the prompt
+    return generate_chart_prompt(
+        data=precip_analysis_df,
+        selected_month=selected_month,
+        chart_title="precipitation",
+        instructions=(
+            f"Analyse precipitation patterns across locations for the selected month. "
+            f"Compare observed data, such as total and 5-day cumulative precipitation, "
+            f"with the country-wide historic average precipitation value of {historic_precip_total} mm for {selected_month}. "
+            f"Highlight stations with significant deviations and discuss the implications for flood risk, water resource availability, "
+            f"and vulnerable populations. In avoiding non-technical language, refer to precipitation as rain."
+        )
+    )
+
+
+# Wind speed statistics in the wind prompt, as (compute_wind_stats column, prompt column)
+WIND_PROMPT_COLUMNS = {
+    ("avg", "mean"): "Average of Average Wind Speed (km/h)",
+    ("avg", "max"): "Maximum of Average Wind Speed (km/h)",
+    ("max", "mean"): "Average of Maximum Sustained Wind Speed (km/h)",
+    ("max", "max"): "Maximum of Maximum Sustained Wind Speed (km/h)",
+    ("gust", "mean"): "Average of Maximum Gust (km/h)",
+    ("gust", "max"): "Maximum of Maximum Gust (km/h)",
+}
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def build_wind_prompt(wind_stats, selected_month):
+    """
+    Builds the ChatGPT prompt for the monthly wind speed analysis.
+
+    Args:
+        wind_stats (pd.DataFrame): Per-station wind speed statistics from compute_wind_stats.
+        selected_month (str): The selected month, e.g. "December 2024".
+
+    Returns:
+        str: The prompt text.
+    """
+    # Convert all 6 wind speed metrics to km/h in one step (missing statistics are left empty)
+    wind_analysis_df = (wind_stats[list(WIND_PROMPT_COLUMNS)] * 3.6).round(1)
+    wind_analysis_df.columns = list(WIND_PROMPT_COLUMNS.values())
+    wind_analysis_df = wind_analysis_df.astype(object).where(wind_analysis_df.notna(), None)
+
+    # Stations without any rows for the month are not part of the statistics
+    wind_analysis_df = wind_analysis_df.rename_axis("Station").reset_index()
+
+    # Generate the prompt
+    return generate_chart_prompt(
+        data=wind_analysis_df,
+        selected_month=selected_month,
+        chart_title="Wind Speed Analysis",
+        instructions=(
+            "Review the wind speed statistics for each location for the selected month. The data includes six key values for wind speed at each location:\n"
+            "- The average of the daily average wind speeds\n"
+            "- The highest daily average wind speed recorded\n"
+            "- The average of the daily maximum sustained wind speeds\n"
+            "- The highest daily maximum sustained wind speed recorded\n"
+            "- The average of the daily maximum gusts\n"
+            "- The highest daily maximum gust recorded\n\n"
+            "Please explain these statistics in a simple and easy-to-understand way for a general audience. "
+            "Describe how these wind conditions might impact everyday life, including infrastructure, the likelihood of dust storms, "
+            "and how they might affect vulnerable populations like internally displaced persons (IDPs). "
+            "Avoid using technical terms and focus on providing clear, practical explanations of what the data means."
+        )
+    )
+
+
+def store_generated_prompt(session_key, build_prompt, *args):
+    """
+    Button callback that builds a ChatGPT prompt and stores it in session state.
+
+    Args:
+        session_key (str): The session state key the prompt is stored under.
+        build_prompt (callable): The prompt builder, e.g. build_precipitation_prompt.
+        *args: Arguments passed on to the prompt builder.
+    """
+    st.session_state[session_key] = build_prompt(*args)